@@ -1,17 +1,22 @@
 """Document management endpoints."""
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+import asyncio
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 
 from app.api.schemas import (
     DocumentListResponse,
     DocumentUploadResponse,
     ErrorResponse,
+    FileUploadResult,
 )
-from app.core.document_processor import DocumentProcessor
-from app.core.vector_store import VectorStoreService
+from app.config import get_settings
+from app.core.document_processor import DocumentProcessor, get_document_processor
+from app.core.vector_store import VectorStoreService, get_vector_store
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
+settings = get_settings()
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
 
@@ -22,59 +27,88 @@ router = APIRouter(prefix="/documents", tags=["Documents"])
         400: {"model": ErrorResponse, "description": "Invalid file type"},
         500: {"model": ErrorResponse, "description": "Processing error"},
     },
-    summary="Upload and ingest a document",
-    description="Upload a document (PDF, TXT, or CSV) to be processed and added to the vector store.",
+    summary="Upload and ingest documents",
+    description="Upload one or more documents (PDF, TXT, or CSV) to be processed and added to the vector store.",
 )
 async def upload_document(
-    file: UploadFile = File(..., description="Document file to upload"),
+    files: list[UploadFile] = File(..., description="Document files to upload"),
+    processor: DocumentProcessor = Depends(get_document_processor),
+    vector_store: VectorStoreService = Depends(get_vector_store),
 ) -> DocumentUploadResponse:
-    """Upload and process a document."""
-    logger.info(f"Received document upload: {file.filename}")
+    """Upload and process one or more documents concurrently."""
+    logger.info(f"Received document upload: {len(files)} file(s)")
 
-    # Validate file
-    if not file.filename:
-        raise HTTPException(
-            status_code=400,
-            detail="Filename is required",
-        )
+    # Bound concurrency so a large batch doesn't overwhelm OpenAI/Qdrant
+    semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_UPLOADS)
 
-    try:
-        # Process document
-        processor = DocumentProcessor()
-        chunks = processor.process_upload(file.file, file.filename)
-
-        if not chunks:
-            raise HTTPException(
-                status_code=400,
-                detail="No content could be extracted from the document",
+    async def _process_one(file: UploadFile) -> FileUploadResult:
+        """Process a single uploaded file (parse, chunk, embed, store)."""
+        if not file.filename:
+            raise ValueError("Filename is required")
+
+        async with semaphore:
+            # Parsing is sync/CPU-bound, so run it off the event loop
+            chunks = await asyncio.to_thread(
+                processor.process_upload, file.file, file.filename
             )
 
-        # Add to vector store
-        vector_store = VectorStoreService()
-        document_ids = vector_store.add_documents(chunks)
+            if not chunks:
+                raise ValueError("No content could be extracted from the document")
 
-        logger.info(
-            f"Successfully processed {file.filename}: "
-            f"{len(chunks)} chunks, {len(document_ids)} documents"
-        )
+            document_ids = await vector_store.aadd_documents(chunks)
 
-        return DocumentUploadResponse(
-            message="Document uploaded and processed successfully",
-            filename=file.filename,
-            chunks_created=len(chunks),
-            document_ids=document_ids,
-        )
+            logger.info(
+                f"Successfully processed {file.filename}: "
+                f"{len(chunks)} chunks, {len(document_ids)} documents"
+            )
 
-    except ValueError as e:
-        logger.warning(f"Invalid file upload: {e}")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        logger.error(f"Error processing document: {e}")
+            return FileUploadResult(
+                filename=file.filename,
+                chunks_created=len(chunks),
+                document_ids=document_ids,
+            )
+
+    results = await asyncio.gather(
+        *[_process_one(file) for file in files],
+        return_exceptions=True,
+    )
+
+    file_results: list[FileUploadResult] = []
+    for file, result in zip(files, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Upload failed for {file.filename}: {result}")
+            file_results.append(
+                FileUploadResult(
+                    filename=file.filename or "<unnamed>",
+                    chunks_created=0,
+                    document_ids=[],
+                    error=str(result),
+                )
+            )
+        else:
+            file_results.append(result)
+
+    succeeded = [r for r in file_results if r.error is None]
+    if not succeeded:
+        # Nothing was ingested; keep the baseline status mapping:
+        # ValueError (bad filename, unsupported type, empty document) is the
+        # client's fault, anything else (OpenAI/Qdrant failures) is ours
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures and all(isinstance(e, ValueError) for e in failures):
+            raise HTTPException(status_code=400, detail=str(failures[0]))
         raise HTTPException(
             status_code=500,
-            detail=f"Error processing document: {str(e)}",
+            detail=f"Error processing documents: {failures[0] if failures else 'No files provided'}",
         )
 
+    return DocumentUploadResponse(
+        message="Documents uploaded and processed successfully",
+        filename=", ".join(r.filename for r in succeeded),
+        chunks_created=sum(r.chunks_created for r in succeeded),
+        document_ids=[doc_id for r in succeeded for doc_id in r.document_ids],
+        files=file_results,
+    )
+
 
 @router.get(
     "/info",
@@ -82,12 +116,13 @@ async def upload_document(
     summary="Get collection information",
     description="Get information about the document collection.",
 )
-async def get_collection_info() -> DocumentListResponse:
+async def get_collection_info(
+    vector_store: VectorStoreService = Depends(get_vector_store),
+) -> DocumentListResponse:
     """Get information about the document collection."""
     logger.debug("Collection info requested")
 
     try:
-        vector_store = VectorStoreService()
         info = vector_store.get_collection_info()
 
         return DocumentListResponse(
@@ -112,12 +147,13 @@ async def get_collection_info() -> DocumentListResponse:
     summary="Delete the entire collection",
     description="Delete all documents from the vector store. Use with caution!",
 )
-async def delete_collection() -> dict:
+async def delete_collection(
+    vector_store: VectorStoreService = Depends(get_vector_store),
+) -> dict:
     """Delete the entire document collection."""
     logger.warning("Collection deletion requested")
 
     try:
-        vector_store = VectorStoreService()
         vector_store.delete_collection()
 
         return {"message": "Collection deleted successfully"}
@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException
 
 from app import __version__
 from app.api.schemas import HealthCheckResponse, ReadinessResponse
-from app.core.vector_store import VectorStoreService
+from app.core.vector_store import get_vector_store
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -41,7 +41,7 @@ async def readiness_check() -> ReadinessResponse:
 
     try:
         # Check Qdrant connection
-        vector_store = VectorStoreService()
+        vector_store = get_vector_store()
         is_healthy = vector_store.health_check()
 
         if not is_healthy:
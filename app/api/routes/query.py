@@ -155,10 +155,10 @@ async def search_documents(
     logger.info(f"Search received: {request.question[:100]}...")
 
     try:
-        from app.core.vector_store import VectorStoreService
+        from app.core.vector_store import get_vector_store
 
-        vector_store = VectorStoreService()
-        results = vector_store.search_with_scores(request.question)
+        vector_store = get_vector_store()
+        results = await vector_store.asearch_with_scores(request.question)
 
         documents = [
             {
@@ -26,13 +26,26 @@ class ReadinessResponse(BaseModel):
 
 """Document Schemas""" 
 
+class FileUploadResult(BaseModel):
+    """Per-file result within a batch upload."""
+
+    filename: str = Field(..., description="Uploaded filename")
+    chunks_created: int = Field(..., description="Number of chunks created")
+    document_ids: list[str] = Field(..., description="List of document IDs")
+    error: str | None = Field(None, description="Error message if this file failed")
+
+
 class DocumentUploadResponse(BaseModel):
     """Response after document upload."""
 
     message: str = Field(..., description="Status message")
-    filename: str = Field(..., description="Uploaded filename")
-    chunks_created: int = Field(..., description="Number of chunks created")
+    filename: str = Field(..., description="Uploaded filename(s)")
+    chunks_created: int = Field(..., description="Total number of chunks created")
     document_ids: list[str] = Field(..., description="List of document IDs")
+    files: list[FileUploadResult] = Field(
+        default_factory=list,
+        description="Per-file upload results",
+    )
 
 
 class DocumentInfo(BaseModel):
@@ -17,13 +17,16 @@ class Settings(BaseSettings):
     #qdrant config cloud
     QDRANT_URL: str
     QDRANT_API_KEY: str
+    QDRANT_QUANTIZATION: bool = True  # Quantize stored vectors at collection creation
     
     #collection settings   
     COLLECTION_NAME: str = "rag_documents"
     
-    #document processing settings
-    CHUNK_SIZE: int = 1000
-    CHUNK_OVERLAP: int = 200
+    #document processing settings (chunk sizes are measured in tokens of the
+    #embedding model, not characters)
+    CHUNK_SIZE: int = 300
+    CHUNK_OVERLAP: int = 50
+    MAX_CONCURRENT_UPLOADS: int = 4
     
     #model configuration
     llm_model: str = "gpt-4o-mini"
@@ -40,6 +43,9 @@ class Settings(BaseSettings):
     ragas_llm_model: str | None = None  # Defaults to llm_model if not set
     ragas_llm_temperature: float | None = None  # Defaults to llm_temperature if not set
     ragas_embedding_model: str | None = None  # Defaults to embedding_model if not set
+    ragas_batch_evaluation: bool = False  # Batch pending evaluations into one evaluate() call
+    ragas_batch_max_size: int = 16
+    ragas_batch_flush_ms: float = 500.0
     
     # #adding langsmith config
     # LANGSMITH_API_KEY: str
@@ -1,31 +1,135 @@
 """Embeddings Generation Module using OpenAI API."""
 
-from functools import lru_cache 
+import asyncio
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
 
-from langchain_openai import OpenAIEmbeddings
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from app.config import get_settings
-from app.utils.logger import get_logger 
+from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-@lru_cache()
-def get_embeddings() -> OpenAIEmbeddings: 
+#number of texts sent to the OpenAI API per batch request
+EMBED_BATCH_SIZE = 1000
+#cap on embedding batch requests in flight at once to stay under rate limits
+MAX_CONCURRENT_EMBED_BATCHES = 8
+#per-request token budget for the embeddings endpoint (text-embedding-3-small)
+EMBED_BATCH_TOKEN_BUDGET = 250_000
+#rough characters-per-token ratio used to budget batches without a tokenizer
+_CHARS_PER_TOKEN = 4
+
+#cap on cached document embeddings; a 1536-float list is tens of KB, so an
+#unbounded cache would grow by roughly a GB per ~50k unique chunks ingested
+EMBED_CACHE_MAX_ENTRIES = 10_000
+
+#process-wide embedding cache keyed by content hash + model, so chunks seen in
+#a previous upload (re-uploaded or overlapping documents) skip the OpenAI call
+#LRU-bounded: OrderedDict evicts the least recently used entry past the cap
+_EMBEDDING_CACHE: OrderedDict[str, list[float]] = OrderedDict()
+
+
+def _cache_key(text: str, model: str) -> str:
+    """build a cache key from the content hash and the embedding model name"""
+    #the model is part of the key so switching models invalidates old entries
+    return hashlib.sha256(text.encode("utf-8")).hexdigest() + ":" + model
+
+
+@lru_cache(maxsize=1024)
+def _embed_query_cached(model: str, query: str) -> tuple[float, ...]:
+    """embed a query string once per (model, query) pair
+
+    Repeated questions are common within a session; this turns the OpenAI
+    round-trip into an in-memory lookup. Returns a tuple because lru_cache
+    entries should be immutable.
+    """
+    return tuple(get_embeddings(model).embed_query(query))
+
+
+def _pack_batches(documents: list[str]) -> list[list[int]]:
+    """Pack document indices into length-sorted batches under the token budget.
+
+    Chunks from the text splitter vary in length, so fixed-size batches waste
+    the per-request token budget. Sorting by length and packing greedily keeps
+    each request close to the budget and reduces the number of API calls.
+
+    Args:
+        documents (list[str]): list of input document strings
+    Returns:
+        list[list[int]]: batches of indices into the original list, so callers
+            can scatter results back into input order
+    """
+    char_budget = EMBED_BATCH_TOKEN_BUDGET * _CHARS_PER_TOKEN
+    order = sorted(range(len(documents)), key=lambda i: len(documents[i]))
+
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_chars = 0
+    for idx in order:
+        doc_chars = len(documents[idx])
+        if batch and (batch_chars + doc_chars > char_budget
+                      or len(batch) >= EMBED_BATCH_SIZE):
+            batches.append(batch)
+            batch = []
+            batch_chars = 0
+        batch.append(idx)
+        batch_chars += doc_chars
+    if batch:
+        batches.append(batch)
+    return batches
+
+def get_embeddings(model: str | None = None) -> OpenAIEmbeddings:
     """
     get cached openai embeddings instance
 
+    Args:
+        model (str | None): embedding model name, defaults to the configured
+            embedding_model setting
     Returns:
         OpenAIEmbeddings: OpenAI embeddings instance
     """
+    return _get_embeddings_for(model or get_settings().embedding_model)
+
+
+@lru_cache()
+def _get_embeddings_for(model: str) -> OpenAIEmbeddings:
+    """create (once per model) the shared OpenAIEmbeddings instance"""
     settings = get_settings()
-    logger.info("Creating OpenAI Embeddings instance")
-    
+    logger.info(f"Creating OpenAI Embeddings instance for {model}")
+
     embeddings = OpenAIEmbeddings(
-        model=settings.embedding_model,
+        model=model,
         openai_api_key=settings.OPENAI_API_KEY
     )
-    
+
     logger.info("OpenAI Embeddings instance created successfully")
-    return embeddings 
+    return embeddings
+
+
+@lru_cache()
+def get_chat_model(model: str, temperature: float) -> ChatOpenAI:
+    """
+    get cached ChatOpenAI instance for a model/temperature pair
+
+    ChatOpenAI owns an httpx connection pool; caching means every RAGChain
+    and RAGASEvaluator built with the same configuration shares one client
+    instead of opening a fresh pool (and TLS handshake) per construction.
+
+    Args:
+        model (str): chat model name
+        temperature (float): sampling temperature
+    Returns:
+        ChatOpenAI: chat model instance
+    """
+    settings = get_settings()
+    logger.info(f"Creating ChatOpenAI instance for {model} (temperature={temperature})")
+
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=settings.OPENAI_API_KEY
+    )
 
 
 class EmbeddingService:
@@ -36,7 +140,8 @@ class EmbeddingService:
         """
         settings = get_settings()
         self.embeddings = get_embeddings()
-        
+        self.model = settings.embedding_model
+
     def embed_query(self,query:str) ->list[float]:
         """Generate embedding for a query string
 
@@ -46,7 +151,7 @@ class EmbeddingService:
             list[float]: embedding vector
         """
         logger.debug(f"Generating embedding for query: {query[:100]}...")
-        return self.embeddings.embed_query(query)
+        return list(_embed_query_cached(self.model, query))
     
     def embed_documents(self,documents:list[str]) ->list[list[float]]:
         """Generate embeddings for a list of documents
@@ -57,8 +162,80 @@ class EmbeddingService:
             list[list[float]]: list of embedding vectors
         """
         logger.debug(f"Generating embeddings for {len(documents)} documents...")
-        return self.embeddings.embed_documents(documents)
-    
+
+        embeddings, misses = self._lookup_cache(documents)
+        miss_texts = [documents[i] for i in misses]
+        for batch in _pack_batches(miss_texts):
+            vectors = self.embeddings.embed_documents([miss_texts[j] for j in batch])
+            for j, vec in zip(batch, vectors):
+                self._store(documents[misses[j]], vec)
+                embeddings[misses[j]] = vec
+        return embeddings
+
+    def _lookup_cache(self,documents:list[str]) -> tuple[list[list[float]], list[int]]:
+        """partition documents into cached embeddings and miss indices
+
+        Args:
+            documents (list[str]): list of input document strings
+        Returns:
+            tuple: embeddings list with cache hits filled (misses left None)
+                and the list of indices still needing an API call
+        """
+        embeddings: list[list[float]] = [None] * len(documents)  # type: ignore[list-item]
+        misses: list[int] = []
+        for i, doc in enumerate(documents):
+            key = _cache_key(doc, self.model)
+            cached = _EMBEDDING_CACHE.get(key)
+            if cached is not None:
+                _EMBEDDING_CACHE.move_to_end(key)
+                embeddings[i] = cached
+            else:
+                misses.append(i)
+        if documents:
+            logger.debug(f"Embedding cache: {len(documents) - len(misses)} hits, "
+                         f"{len(misses)} misses")
+        return embeddings, misses
+
+    def _store(self,document:str,vector:list[float]) -> None:
+        """store an embedding in the content-hash cache, evicting past the cap"""
+        _EMBEDDING_CACHE[_cache_key(document, self.model)] = vector
+        while len(_EMBEDDING_CACHE) > EMBED_CACHE_MAX_ENTRIES:
+            _EMBEDDING_CACHE.popitem(last=False)
+
+    async def aembed_documents(self,documents:list[str]) ->list[list[float]]:
+        """Generate embeddings for a list of documents concurrently
+
+        Splits the documents into batches and submits them to the OpenAI API
+        with asyncio.gather so the HTTP round-trips overlap instead of running
+        one after the other. A semaphore caps in-flight requests so we do not
+        blow through rate limits.
+
+        Args:
+            documents (list[str]): list of input document strings
+        Returns:
+            list[list[float]]: list of embedding vectors in the original order
+        """
+        logger.debug(f"Generating embeddings concurrently for {len(documents)} documents...")
+
+        embeddings, misses = self._lookup_cache(documents)
+        miss_texts = [documents[i] for i in misses]
+        batches = _pack_batches(miss_texts)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBED_BATCHES)
+
+        async def embed_batch(batch: list[int]) -> list[list[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(
+                    [miss_texts[j] for j in batch])
+
+        results = await asyncio.gather(*[embed_batch(batch) for batch in batches])
+
+        #scatter batch results back into input order
+        for batch, vectors in zip(batches, results):
+            for j, vec in zip(batch, vectors):
+                self._store(documents[misses[j]], vec)
+                embeddings[misses[j]] = vec
+        return embeddings
+
     
 # list[float] | list[list[float]] can be used for type hinting in Python 3.9+
 # it is equivalent to typing.List[float] | typing.List[typing.List[float]]
\ No newline at end of file
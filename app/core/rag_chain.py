@@ -1,13 +1,16 @@
 """RAG Chain Module."""
 
-from langchain_openai import ChatOpenAI
+import asyncio
+from operator import itemgetter
+
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.documents import Document
 
 from app.utils.logger import get_logger
-from app.config import get_settings 
+from app.config import get_settings
+from app.core.embedding import get_chat_model
 from app.core.vector_store import VectorStoreService
 
 logger = get_logger(__name__)
@@ -31,6 +34,15 @@ def format_docs(docs:list[Document]):
     return "\n\n".join([doc.page_content for doc in docs])
 
 
+#max characters of each source document echoed back in a response
+SNIPPET_LENGTH = 500
+
+
+def _snippet(text: str, limit: int = SNIPPET_LENGTH) -> str:
+    """truncate source content for the response payload."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
 class RAGChain:
     """rag chain class."""
     
@@ -41,12 +53,9 @@ class RAGChain:
         
         self._evaluator = None 
         
-        # initialize llm
-        self.llm = ChatOpenAI(
-            model= settings.llm_model,
-            temperature= settings.llm_temperature,
-            openai_api_key= settings.OPENAI_API_KEY)
-        
+        # initialize llm (shared cached client, one connection pool per config)
+        self.llm = get_chat_model(settings.llm_model, settings.llm_temperature)
+
         #create prompt
         self.prompt= ChatPromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
         
@@ -54,18 +63,41 @@ class RAGChain:
             {"context":self.retriever |format_docs,
              "question": RunnablePassthrough()}
             |self.prompt
-            |self.llm 
+            |self.llm
             | StrOutputParser()
         )
-        
+
+        #chain variant that retrieves once and keeps the docs alongside the
+        #answer, so the *_with_sources methods don't embed the question and
+        #hit Qdrant a second time just to report sources
+        #piping the retriever as a runnable (instead of a sync lambda) means
+        #ainvoke uses the retriever's native async path rather than blocking
+        #the event loop on the Qdrant round-trip
+        self.chain_with_docs = RunnablePassthrough.assign(
+            docs=itemgetter("question") | self.retriever,
+        ) | RunnablePassthrough.assign(
+            answer=(
+                {"context": lambda x: format_docs(x["docs"]),
+                 "question": lambda x: x["question"]}
+                | self.prompt
+                | self.llm
+                | StrOutputParser()
+            ),
+        )
+
         logger.info(f"RAG Chain initialized successfully. with model {settings.llm_model}")
     
     @property
     def evaluator(self):
-        """get or create RAGAS evaluator instance"""
+        """get the shared RAGAS evaluator instance
+
+        Process-wide (not per chain): query.py builds a RAGChain per
+        request, and the evaluation batch queue can only coalesce
+        concurrent requests if they all submit to the same evaluator.
+        """
         if self._evaluator is None:
-            from app.core.ragas_evaluator import RAGASEvaluator
-            self._evaluator = RAGASEvaluator()
+            from app.core.ragas_evaluator import get_evaluator
+            self._evaluator = get_evaluator()
         return self._evaluator
     
     
@@ -86,16 +118,13 @@ class RAGChain:
         logger.info(f"Processing RAG query with sources: {question[:50]}...")
         
         try:
-            answer =self.chain.invoke({"question": question})
-            source_docs = self.retriever.invoke(question)
-            
+            result = self.chain_with_docs.invoke({"question": question})
+            answer = result["answer"]
+            source_docs = result["docs"]
+
             sources = [
                 {
-                    "content": (
-                        doc.page_content[:500] + "..." 
-                        if len(doc.page_content) > 500 
-                        else doc.page_content
-                    ),
+                    "content": _snippet(doc.page_content),
                     "metadata": doc.metadata
                 } for doc in source_docs]
             
@@ -132,20 +161,15 @@ class RAGChain:
         logger.info(f"Processing async query with sources: {question[:100]}...")
 
         try:
-            # Get answer
-            answer = await self.chain.ainvoke(question)
-
-            # Get source documents (sync operation)
-            source_docs = self.retriever.invoke(question)
+            # Single pass: retrieve once, generate, and keep the docs
+            result = await self.chain_with_docs.ainvoke({"question": question})
+            answer = result["answer"]
+            source_docs = result["docs"]
 
             # Format sources
             sources = [
                 {
-                    "content": (
-                        doc.page_content[:500] + "..."
-                        if len(doc.page_content) > 500
-                        else doc.page_content
-                    ),
+                    "content": _snippet(doc.page_content),
                     "metadata": doc.metadata,
                 }
                 for doc in source_docs
@@ -174,11 +198,25 @@ class RAGChain:
         logger.info(f"Processing query with evaluation: {question[:100]}...")
 
         try:
+            # RAGAS computes its own embeddings inside evaluate(), so the only
+            # evaluation work independent of the answer is building the
+            # evaluator (LLM + embedding client construction). Warm it in the
+            # background while the answer is generated instead of paying for
+            # it serially on the first evaluated query.
+            warmup_task = (
+                asyncio.create_task(asyncio.to_thread(lambda: self.evaluator))
+                if self._evaluator is None
+                else None
+            )
+
             # Get answer and sources
             result = await self.aquery_with_sources(question)
             answer = result["answer"]
             sources = result["sources"]
 
+            if warmup_task is not None:
+                await warmup_task
+
             # Prepare contexts for evaluation
             contexts = [source["content"] for source in sources]
 
@@ -1,26 +1,97 @@
 """RAGAS evaluation module for RAG quality assessment."""
 
-import asyncio 
-import time 
-from typing import Any 
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any
 
-from datasets import Dataset 
+import pyarrow as pa
+from datasets import Dataset
 #datasets is a library for handling datasets in machine learning from Hugging Face
 # It provides tools for loading, processing, and evaluating datasets.
 # with ragas-evaluator, we can evaluate the quality of retrieval-augmented generation (RAG) systems.
 #datasets imports for ragas is used to load and manage datasets for evaluating RAG systems.
 
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings 
-from ragas import evaluate 
-from ragas.metrics import answer_relevancy ,faithfulness 
+from ragas import evaluate
+from ragas.metrics import answer_relevancy ,faithfulness
 
 from app.config import get_settings
+from app.core.embedding import get_chat_model, get_embeddings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+#one evaluation row: (question, answer, contexts)
+_EvalRow = tuple[str, str, list[str]]
 
-class RAGASEvaluator: 
+
+class EvaluationQueue:
+    """Batch pending evaluations into a single ragas evaluate() call.
+
+    ragas batches its LLM calls per metric per row, so N one-row evaluations
+    cost N times the LLM/embedding round-trips of one N-row evaluation. The
+    queue collects rows until either max_batch is reached or flush_ms elapses,
+    evaluates them together, and resolves each caller's future with its row.
+    """
+
+    def __init__(self, evaluator: "RAGASEvaluator",
+                 max_batch: int, flush_ms: float) -> None:
+        """initialize the queue around an evaluator instance"""
+        self._evaluator = evaluator
+        self._max_batch = max_batch
+        self._flush_seconds = flush_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, question: str, answer: str,
+                     contexts: list[str]) -> dict[str, Any]:
+        """enqueue one evaluation row and wait for its scores"""
+        loop = asyncio.get_running_loop()
+        #the worker is started lazily so the queue can be built outside a
+        #running event loop
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._drain())
+        future: asyncio.Future = loop.create_future()
+        await self._queue.put(((question, answer, contexts), future))
+        return await future
+
+    def shutdown(self) -> None:
+        """cancel the drain worker (pending submissions are cancelled too)"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._worker = None
+
+    async def _drain(self) -> None:
+        """collect rows until the batch is full or the flush window closes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            row, future = await self._queue.get()
+            batch = [(row, future)]
+            deadline = loop.time() + self._flush_seconds
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            rows = [item[0] for item in batch]
+            logger.debug(f"Flushing evaluation batch of {len(rows)} row(s)")
+            try:
+                records = await asyncio.to_thread(
+                    self._evaluator._evaluate_rows, rows)
+                for (_, fut), record in zip(batch, records):
+                    if not fut.done():
+                        fut.set_result(record)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+
+class RAGASEvaluator:
     """initialize a RAGAS evaluator instance."""
     def __init__(self):
         """initialization method."""
@@ -33,18 +104,30 @@ class RAGASEvaluator:
         
         eval_embedding_model =self.settings.ragas_embedding_model or self.settings.embedding_model
         
-        #initialize llm for evaluation 
-        self.llm = ChatOpenAI(
-            model_name=eval_llm_model,
-            temperature=eval_llm_temperature,
-            openai_api_key=self.settings.OPENAI_API_KEY,)
-        
-        self.embedding_model = OpenAIEmbeddings(
-            model=eval_embedding_model,
-            openai_api_key=self.settings.OPENAI_API_KEY,)
-        
+        #initialize llm for evaluation (shared cached clients, so repeated
+        #evaluator construction doesn't open fresh connection pools)
+        self.llm = get_chat_model(eval_llm_model, eval_llm_temperature)
+
+        self.embedding_model = get_embeddings(eval_embedding_model)
+
         self.metrics =[faithfulness, answer_relevancy]
-        
+
+        #prebuilt Arrow schema so per-query Dataset construction skips
+        #schema inference
+        self._schema = pa.schema([
+            ("question", pa.string()),
+            ("answer", pa.string()),
+            ("contexts", pa.list_(pa.string())),
+        ])
+
+        #opt-in batcher that coalesces concurrent evaluations into one
+        #evaluate() call (see EvaluationQueue)
+        self._batch_queue = EvaluationQueue(
+            self,
+            max_batch=self.settings.ragas_batch_max_size,
+            flush_ms=self.settings.ragas_batch_flush_ms,
+        )
+
         logger.info(f"RAGAS evaluator initialized"
                     f"LLM Model: {eval_llm_model}, "
                     f"Embedding Model: {eval_embedding_model}"
@@ -60,15 +143,19 @@ class RAGASEvaluator:
         logger.debug(f"Starting RAGAS evaluation...for question: {question[:100]}")
         start_time = time.time()
         
-        try: 
-            #prep dataset for ragas
-            dataset = self._prepare_dataset(question,answer,contexts)
-            
-            #run evaluation in thread pool to avoid blocking event loop
-            result = await asyncio.to_thread(
-                self._evaluate_with_timeout,
-                dataset,)
-            
+        try:
+            if self.settings.ragas_batch_evaluation:
+                #coalesce with other pending evaluations into one call
+                result = await self._batch_queue.submit(question, answer, contexts)
+            else:
+                #prep dataset for ragas
+                dataset = self._prepare_dataset(question,answer,contexts)
+
+                #run evaluation in thread pool to avoid blocking event loop
+                result = await asyncio.to_thread(
+                    self._evaluate_with_timeout,
+                    dataset,)
+
             evaluation_time_ms = (time.time() - start_time) * 1000
             
             #extract scores 
@@ -117,7 +204,10 @@ class RAGASEvaluator:
             f"Prepared dataset with {len(contexts)} contexts " f"for question: {question[:50]}..."
         )
 
-        return Dataset.from_dict(data)
+        # Build against the cached schema instead of letting from_dict infer
+        # a fresh one per evaluation
+        table = pa.Table.from_pydict(data, schema=self._schema)
+        return Dataset(table)
 
     def _evaluate_with_timeout(self, dataset: Dataset) -> dict[str, Any]:
         """Execute RAGAS evaluation with timeout.
@@ -144,6 +234,31 @@ class RAGASEvaluator:
         # Convert to dictionary and extract scores
         return result.to_pandas().to_dict("records")[0]
 
+    def _evaluate_rows(self, rows: list[_EvalRow]) -> list[dict[str, Any]]:
+        """Execute one RAGAS evaluation over multiple rows.
+
+        Args:
+            rows: List of (question, answer, contexts) tuples
+
+        Returns:
+            Per-row result dictionaries, in input order
+        """
+        data = {
+            "question": [row[0] for row in rows],
+            "answer": [row[1] for row in rows],
+            "contexts": [row[2] for row in rows],
+        }
+        table = pa.Table.from_pydict(data, schema=self._schema)
+
+        result = evaluate(
+            Dataset(table),
+            metrics=self.metrics,
+            llm=self.llm,
+            embeddings=self.embedding_model,
+        )
+
+        return result.to_pandas().to_dict("records")
+
     def _handle_evaluation_error(self, error: Exception) -> dict[str, Any]:
         """Return safe fallback scores on error.
 
@@ -160,4 +275,21 @@ class RAGASEvaluator:
             "answer_relevancy": None,
             "evaluation_time_ms": None,
             "error": str(error),
-        }                    
\ No newline at end of file
+        }
+
+
+@lru_cache
+def get_evaluator() -> RAGASEvaluator:
+    """Get the process-wide RAGASEvaluator.
+
+    The batch queue only coalesces anything if concurrent requests share
+    one instance; a per-RAGChain evaluator would give every request its
+    own one-row queue.
+    """
+    return RAGASEvaluator()
+
+
+def shutdown_evaluator() -> None:
+    """stop the cached evaluator's batch worker, if one was ever built."""
+    if get_evaluator.cache_info().currsize:
+        get_evaluator()._batch_queue.shutdown()
\ No newline at end of file
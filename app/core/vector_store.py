@@ -1,18 +1,20 @@
 """Vector store module for qdrant operations"""
-from functools import lru_cache 
+import asyncio
+import hashlib
+import time
+from functools import lru_cache
 from typing import Any
-from uuid import uuid4
-#uuid4 generates a random UUID
+from uuid import NAMESPACE_URL, uuid5
 
-from langchain_core.documents import Document 
+from langchain_core.documents import Document
 from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient
-from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http import models
 from qdrant_client.http.models import Distance, VectorParams
 
 from app.config import get_settings
 from app.utils.logger import get_logger
-from app.core.embedding import get_embeddings
+from app.core.embedding import EmbeddingService, get_embeddings
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -20,21 +22,71 @@ settings = get_settings()
 #embedding dimension for text-embedding-3-small model
 EMBEDDING_DIMENSION = 1536
 
+#points per upsert request; large ingests are sent in slices this size
+UPSERT_BATCH_SIZE = 512
+
+#smaller slices for the async path, where many upserts run concurrently and
+#the pool (pool_size=100) keeps them all in flight
+ASYNC_UPSERT_BATCH_SIZE = 64
+
+#seconds to serve collection stats from memory before asking the server again
+COLLECTION_INFO_TTL = 30.0
+
+
+#process-wide client singletons; plain module globals skip the lru_cache
+#dict lookup and lock that every VectorStoreService construction would pay
+_CLIENT: QdrantClient | None = None
+_ACLIENT: AsyncQdrantClient | None = None
+
+#collections already verified/created this process; lets repeat service
+#construction skip the get_collection round-trip
+_ENSURED_COLLECTIONS: set[str] = set()
+
+
+def _content_id(text: str) -> str:
+    """derive a deterministic point ID from chunk content
+
+    Qdrant point IDs must be UUIDs (or ints), so the sha256 of the content
+    is folded into a UUIDv5. Identical chunks always map to the same point,
+    which is what lets re-ingests skip work.
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return str(uuid5(NAMESPACE_URL, digest))
+
 
-@lru_cache
 def get_qdrant_client() -> QdrantClient:
-    """Get Qdrant client with caching"""
-    logger.info(f"Creating Qdrant client at: {settings.QDRANT_URL}")
-    client = QdrantClient(
-        url =settings.QDRANT_URL,
-        api_key=settings.QDRANT_API_KEY,
-    )
-    return QdrantClient(
-        url=settings.QDRANT_URL,
-        api_key=settings.QDRANT_API_KEY,
-    )   
-    logger.info("Qdrant client created successfully")
-    return client
+    """Get the process-wide Qdrant client, creating it on first use"""
+    global _CLIENT
+    if _CLIENT is None:
+        logger.info("Creating Qdrant client at: %s", settings.QDRANT_URL)
+        #pool_size=100: the default pool of 3 connections serializes
+        #concurrent searches/upserts from the request handlers
+        _CLIENT = QdrantClient(
+            url=settings.QDRANT_URL,
+            api_key=settings.QDRANT_API_KEY,
+            prefer_grpc=True,
+            grpc_port=6334,
+            pool_size=100,
+            timeout=30,
+        )
+        logger.info("Qdrant client created successfully")
+    return _CLIENT
+
+
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    """Get the process-wide async Qdrant client, creating it on first use"""
+    global _ACLIENT
+    if _ACLIENT is None:
+        logger.info("Creating async Qdrant client at: %s", settings.QDRANT_URL)
+        _ACLIENT = AsyncQdrantClient(
+            url=settings.QDRANT_URL,
+            api_key=settings.QDRANT_API_KEY,
+            prefer_grpc=True,
+            grpc_port=6334,
+            pool_size=100,
+            timeout=30,
+        )
+    return _ACLIENT
 
 
 class VectorStoreService: 
@@ -47,100 +99,406 @@ class VectorStoreService:
         
         self.collection_name = collection_name or settings.COLLECTION_NAME
         self.client = get_qdrant_client()
+        self.aclient = get_async_qdrant_client()
         self.embeddings = get_embeddings()
+        #EmbeddingService adds length-packed batching and the content-hash
+        #cache on top of the raw client; used on the ingest path
+        self._embedder = EmbeddingService()
+
+        #LRU over query embeddings: repeated/popular queries skip the OpenAI
+        #round-trip entirely (tuples, since cache entries are shared)
+        self._embed_query = lru_cache(maxsize=10_000)(self._embed_query_uncached)
         self._ensure_collection()
-        
-        #initialize Qdrant vector store 
-        
-        self.vector_store = QdrantVectorStore(
-            client=self.client,
-            collection_name=self.collection_name,
-            embedding=self.embeddings,
-        )
-        
-        logger.info(f"VectorStoreService initialized for collection: {self.collection_name}")
-    
+
+        #the langchain wrapper is only needed by get_retriever; search and
+        #ingest talk to the client directly, so build it lazily
+        self._vector_store: QdrantVectorStore | None = None
+
+        #memoized retrievers (keyed on k) and TTL-cached collection stats
+        self._retrievers: dict[int, Any] = {}
+        self._collection_info: tuple[float, dict] | None = None
+
+        logger.info("VectorStoreService initialized for collection: %s", self.collection_name)
+
+    @property
+    def vector_store(self) -> QdrantVectorStore:
+        """langchain vector-store wrapper, built on first use"""
+        if self._vector_store is None:
+            self._vector_store = QdrantVectorStore(
+                client=self.client,
+                collection_name=self.collection_name,
+                embedding=self.embeddings,
+            )
+        return self._vector_store
+
     def _ensure_collection(self):
         """ensure the Qdrant collection exists"""
-        try:
+        if self.collection_name in _ENSURED_COLLECTIONS:
+            return
+        #collection_exists works the same over REST and gRPC; a missing
+        #collection under gRPC raises grpc.RpcError (NOT_FOUND), not
+        #UnexpectedResponse, so a try/except on the latter never fires
+        if self.client.collection_exists(self.collection_name):
             collection_info = self.client.get_collection(
                 self.collection_name)
-            logger.info(f"Collection '{self.collection_name}' already exists with"
-                        f"with {collection_info.points_count} points")
+            logger.info("Collection '%s' already exists with %s points",
+                        self.collection_name, collection_info.points_count)
             #collection points count is the number of vectors stored in the collection
-        except UnexpectedResponse:
-            logger.info(f"Creation collection: {self.collection_name}")
+        else:
+            logger.info("Creation collection: %s", self.collection_name)
+
+            #binary quantization shrinks stored vectors 32x (1536 float32 ->
+            #192 bytes) and keeps the quantized index in RAM; the OpenAI
+            #embeddings are unit-normalized so they tolerate it well, and
+            #rescoring at search time recovers the lost recall
+            quantization_config = None
+            if settings.QDRANT_QUANTIZATION:
+                quantization_config = models.BinaryQuantization(
+                    binary=models.BinaryQuantizationConfig(always_ram=True)
+                )
+
             self.client.create_collection(collection_name=self.collection_name,
                                           vectors_config = VectorParams(
                                           size=EMBEDDING_DIMENSION,
-                                          distance=Distance.COSINE))
-            logger.info(f"Collection '{self.collection_name}' created successfully")
-    
-    def add_documents(self,documents: list[Document]) -> None:
-        """add documents to the vector store"""
+                                          distance=Distance.COSINE),
+                                          hnsw_config=models.HnswConfigDiff(
+                                              m=16,
+                                              ef_construct=200,
+                                              full_scan_threshold=10000),
+                                          quantization_config=quantization_config)
+
+            #index the metadata fields used for filtered search so the server
+            #does an indexed lookup instead of parsing every candidate payload
+            for field in ("metadata.source", "metadata.document_id"):
+                self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field,
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+            logger.info("Collection '%s' created successfully", self.collection_name)
+        _ENSURED_COLLECTIONS.add(self.collection_name)
+
+    def add_documents(self,documents: list[Document],
+                      ids: list[str] | None = None) -> list[str]:
+        """add documents to the vector store
+
+        Args:
+            documents: documents to upsert
+            ids: optional point IDs; generated when not supplied
+        Returns:
+            the point IDs used
+        """
         if not documents:
             logger.warning("Non Documents to add to vector store")
             return []
-        
-        logger.info(f"adding {len(documents)} documents to vector store")
-        
-        ids = [str(uuid4()) for _ in documents]
-        
-        self.vector_store.add_documents(documents,ids=ids)
+
+        logger.info("adding %d documents to vector store", len(documents))
+
+        texts = [doc.page_content for doc in documents]
+        #content-hash IDs (when the caller doesn't supply its own) make
+        #re-ingests idempotent: chunks already in the collection are skipped
+        dedupe = ids is None
+        ids = ids or [_content_id(text) for text in texts]
+
+        if dedupe:
+            existing = {
+                str(point.id)
+                for point in self.client.retrieve(
+                    self.collection_name, ids=ids,
+                    with_payload=False, with_vectors=False)
+            }
+            todo = [i for i, point_id in enumerate(ids)
+                    if point_id not in existing]
+            if len(todo) < len(documents):
+                logger.info("Skipping %d chunks already in the collection",
+                            len(documents) - len(todo))
+        else:
+            todo = list(range(len(documents)))
+
+        if not todo:
+            logger.info("All documents already present; nothing to upsert")
+            return ids
+
+        #embed everything in batched requests up front (instead of letting
+        #the langchain wrapper embed per document), then upsert the points
+        #directly; wait=False returns once the write is acknowledged rather
+        #than after indexing completes
+        vectors = self._embedder.embed_documents([texts[i] for i in todo])
+        points = [
+            models.PointStruct(
+                id=ids[i],
+                vector=vectors[j],
+                payload={"page_content": texts[i],
+                         "metadata": documents[i].metadata},
+            )
+            for j, i in enumerate(todo)
+        ]
+
+        for start in range(0, len(points), UPSERT_BATCH_SIZE):
+            self.client.upsert(self.collection_name,
+                               points=points[start:start + UPSERT_BATCH_SIZE],
+                               wait=False)
+        logger.info("Documents added successfully")
+        return ids
+
+    async def aadd_documents(self,documents: list[Document],
+                             ids: list[str] | None = None) -> list[str]:
+        """add documents without blocking the event loop
+
+        Embeds through the concurrent batch path, then dispatches small
+        upsert slices in parallel with asyncio.gather so network transfer
+        and server-side writes overlap instead of running serially.
+
+        Args:
+            documents: documents to upsert
+            ids: optional point IDs; generated when not supplied
+        Returns:
+            the point IDs used
+        """
+        if not documents:
+            logger.warning("Non Documents to add to vector store")
+            return []
+
+        logger.info("adding %d documents to vector store (async)", len(documents))
+
+        texts = [doc.page_content for doc in documents]
+        dedupe = ids is None
+        ids = ids or [_content_id(text) for text in texts]
+
+        if dedupe:
+            existing = {
+                str(point.id)
+                for point in await self.aclient.retrieve(
+                    self.collection_name, ids=ids,
+                    with_payload=False, with_vectors=False)
+            }
+            todo = [i for i, point_id in enumerate(ids)
+                    if point_id not in existing]
+            if len(todo) < len(documents):
+                logger.info("Skipping %d chunks already in the collection",
+                            len(documents) - len(todo))
+        else:
+            todo = list(range(len(documents)))
+
+        if not todo:
+            logger.info("All documents already present; nothing to upsert")
+            return ids
+
+        vectors = await self._embedder.aembed_documents([texts[i] for i in todo])
+        points = [
+            models.PointStruct(
+                id=ids[i],
+                vector=vectors[j],
+                payload={"page_content": texts[i],
+                         "metadata": documents[i].metadata},
+            )
+            for j, i in enumerate(todo)
+        ]
+
+        batches = [
+            points[start:start + ASYNC_UPSERT_BATCH_SIZE]
+            for start in range(0, len(points), ASYNC_UPSERT_BATCH_SIZE)
+        ]
+
+        await asyncio.gather(*[
+            self.aclient.upsert(self.collection_name, points=batch, wait=False)
+            for batch in batches
+        ])
         logger.info("Documents added successfully")
         return ids
     
-    def search(self,query:str , k:int | None=None)->list[Document]:
-        """search the vector store for similar documents"""
-        
+    def search(self,query:str , k:int | None=None,
+               ef:int | None=None)->list[Document]:
+        """search the vector store for similar documents
+
+        ef overrides the query-time hnsw_ef, letting callers trade latency
+        for recall per query.
+        """
         k = k or settings.top_k_retrieval
-        logger.info(f"Searching for top {k} documents similar to query")
-        
-        results = self.vector_store.similarity_search(
-            query,k=k)
-        
-        logger.debug(f"Search results: {results}" )
+        logger.info("Searching for top %d documents similar to query", k)
+
+        vector = list(self._embed_query(query))
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            limit=k,
+            with_payload=True,
+            search_params=self._search_params(k, ef),
+        )
+
+        results = [self._point_to_document(point) for point in response.points]
+        logger.debug("Search results: %r", results)
         return results
-    
-    def search_with_scores(self,query:str , k:int |None =None) ->list[tuple[Document, float]]:
+
+    def search_with_scores(self,query:str , k:int |None =None,
+                           ef:int | None=None) ->list[tuple[Document, float]]:
         """search for similar documents with relevance scores"""
         k = k or settings.top_k_retrieval
-        logger.info(f"Searching for top {k} documents similar to query with scores")
-        
-        results = self.vector_store.similarity_search_with_score(
-            query,k=k)
-        
-        logger.debug(f"Search results with scores: {results}")
+        logger.info("Searching for top %d documents similar to query with scores", k)
+
+        vector = list(self._embed_query(query))
+        response = self.client.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            limit=k,
+            with_payload=True,
+            search_params=self._search_params(k, ef),
+        )
+
+        results = [(self._point_to_document(point), point.score)
+                   for point in response.points]
+        logger.debug("Search results with scores: %r", results)
         return results
-    
+
+    def search_many(self,queries:list[str] , k:int | None=None,
+                    ef:int | None=None)->list[list[Document]]:
+        """search for several queries in one round-trip
+
+        Multi-query expansion workflows issue a handful of sub-queries per
+        question; batching them embeds all queries in one request and lets
+        the server amortize work across queries on the same collection.
+        """
+        if not queries:
+            return []
+
+        k = k or settings.top_k_retrieval
+        logger.info("Batch searching %d queries for top %d documents each", len(queries), k)
+
+        vectors = self._embedder.embed_documents(queries)
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=vector,
+                    limit=k,
+                    with_payload=True,
+                    params=self._search_params(k, ef),
+                )
+                for vector in vectors
+            ],
+        )
+
+        return [[self._point_to_document(point) for point in response.points]
+                for response in responses]
+
+    async def asearch(self,query:str , k:int | None=None,
+                      ef:int | None=None)->list[Document]:
+        """search for similar documents without blocking the event loop"""
+        k = k or settings.top_k_retrieval
+        logger.info("Searching (async) for top %d documents similar to query", k)
+
+        vector = await self._aembed_query(query)
+        response = await self.aclient.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            limit=k,
+            with_payload=True,
+            search_params=self._search_params(k, ef),
+        )
+
+        return [self._point_to_document(point) for point in response.points]
+
+    async def asearch_with_scores(self,query:str , k:int |None =None,
+                                  ef:int | None=None) ->list[tuple[Document, float]]:
+        """search with relevance scores without blocking the event loop"""
+        k = k or settings.top_k_retrieval
+        logger.info("Searching (async) for top %d documents similar to query with scores", k)
+
+        vector = await self._aembed_query(query)
+        response = await self.aclient.query_points(
+            collection_name=self.collection_name,
+            query=vector,
+            limit=k,
+            with_payload=True,
+            search_params=self._search_params(k, ef),
+        )
+
+        return [(self._point_to_document(point), point.score)
+                for point in response.points]
+
+    def _embed_query_uncached(self, query: str) -> tuple[float, ...]:
+        """embed a query via the OpenAI API (cache-miss path)"""
+        return tuple(self.embeddings.embed_query(query))
+
+    async def _aembed_query(self, query: str) -> list[float]:
+        """async query embedding that shares the sync LRU
+
+        Cache hits return immediately; misses run the embedding call in a
+        worker thread through the cached wrapper so the result is stored for
+        both the sync and async search paths.
+        """
+        return list(await asyncio.to_thread(self._embed_query, query))
+
+    @staticmethod
+    def _search_params(k: int, ef: int | None) -> models.SearchParams:
+        """build per-query search params with an adaptive hnsw_ef
+
+        hnsw_ef is the query-time recall/latency knob; the default scales
+        with k. rescore + oversampling re-ranks quantized candidates with
+        the full-precision vectors to recover recall lost to quantization.
+        """
+        return models.SearchParams(
+            hnsw_ef=ef or max(k * 4, 64),
+            quantization=models.QuantizationSearchParams(
+                rescore=True,
+                oversampling=2.0,
+            ),
+        )
+
+    @staticmethod
+    def _point_to_document(point: Any) -> Document:
+        """rebuild a langchain Document from a Qdrant point payload"""
+        payload = point.payload or {}
+        return Document(
+            page_content=payload.get("page_content", ""),
+            metadata=payload.get("metadata") or {},
+        )
+
     def delete_collection(self) -> None:
         """Delete the entire collection."""
-        logger.warning(f"Deleting collection: {self.collection_name}")
+        logger.warning("Deleting collection: %s", self.collection_name)
         self.client.delete_collection(self.collection_name)
-        logger.info(f"Collection '{self.collection_name}' deleted")
+        _ENSURED_COLLECTIONS.discard(self.collection_name)
+        self._collection_info = None
+        logger.info("Collection '%s' deleted", self.collection_name)
+        #the cached service singleton keeps serving requests after deletion,
+        #so recreate the (empty) collection right away instead of waiting for
+        #a service construction that never comes
+        self._ensure_collection()
 
     def get_collection_info(self) -> dict:
         """Get information about the collection.
 
+        Stats are served from a short-lived cache so dashboard polling
+        doesn't turn into a network round-trip per request.
+
         Returns:
             Dictionary with collection statistics
         """
-        try:
+        now = time.monotonic()
+        if (self._collection_info is not None
+                and now - self._collection_info[0] < COLLECTION_INFO_TTL):
+            return self._collection_info[1]
+
+        if self.client.collection_exists(self.collection_name):
             info = self.client.get_collection(self.collection_name)
-            return {
+            result = {
                 "name": self.collection_name,
                 "points_count": info.points_count,
                 "indexed_vectors_count": info.indexed_vectors_count,
                 "status": info.status.value,
             }
-        except UnexpectedResponse:
-            return {
+        else:
+            result = {
                 "name": self.collection_name,
                 "points_count": 0,
                 "indexed_vectors_count": 0,
                 "status": "not_found",
             }
 
+        self._collection_info = (now, result)
+        return result
+
     def health_check(self) -> bool:
         """Check if vector store is healthy.
 
@@ -151,7 +509,7 @@ class VectorStoreService:
             self.client.get_collections()
             return True
         except Exception as e:
-            logger.error(f"Vector store health check failed: {e}")
+            logger.error("Vector store health check failed: %s", e)
             return False
     
     def get_retriever(self, k: int | None = None) -> Any:
@@ -165,7 +523,20 @@ class VectorStoreService:
         """
         k = k or settings.top_k_retrieval
 
-        return self.vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": k},
-    )
+        #memoize per k: chains fetch the retriever on every invocation
+        if k not in self._retrievers:
+            self._retrievers[k] = self.vector_store.as_retriever(
+                search_type="similarity",
+                search_kwargs={"k": k},
+            )
+        return self._retrievers[k]
+
+
+@lru_cache
+def get_vector_store() -> VectorStoreService:
+    """Get a cached VectorStoreService for the default collection.
+
+    Reusing one instance across requests keeps the Qdrant connection pool
+    warm instead of paying client construction per request.
+    """
+    return VectorStoreService()
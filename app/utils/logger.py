@@ -1,12 +1,19 @@
 import logging
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
 from functools import cached_property, lru_cache
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+# Listener draining the log queue on its own thread; kept module-global so
+# shutdown_logging can stop it and flush pending records.
+_listener: QueueListener | None = None
 
 def setup_logging(log_level: str = "INFO", log_to_file: bool = True, file_name: str = "app") -> None:
     """Configure logging for the application."""
+    global _listener
+
     formatter = logging.Formatter(
         fmt="[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
@@ -18,18 +25,22 @@ def setup_logging(log_level: str = "INFO", log_to_file: bool = True, file_name:
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+
+    handlers: list[logging.Handler] = [console_handler]
 
     # File handler
     if log_to_file:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = Path.cwd() / f"logs/{file_name}_{timestamp}.log"
         log_file.parent.mkdir(exist_ok=True)
-        
+
         file_handler = TimedRotatingFileHandler(
             filename=str(log_file),
             when="midnight",
@@ -37,7 +48,14 @@ def setup_logging(log_level: str = "INFO", log_to_file: bool = True, file_name:
             backupCount=7,
             encoding="utf-8",)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Callers only pay for enqueueing a record; formatting and file/console
+    # writes happen on the listener thread, off the request/event-loop path.
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     # Silence noisy libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -45,6 +63,14 @@ def setup_logging(log_level: str = "INFO", log_to_file: bool = True, file_name:
     logging.getLogger("openai").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Stop the queue listener, flushing any pending log records."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 @lru_cache
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a module."""
@@ -53,7 +79,7 @@ def get_logger(name: str) -> logging.Logger:
 
 class LoggerMixin:
     """Mixin to add logging to classes."""
-    
+
     @cached_property
     def logger(self) -> logging.Logger:
-        return get_logger(self.__class__.__name__)
\ No newline at end of file
+        return get_logger(self.__class__.__name__)
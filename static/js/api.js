@@ -65,7 +65,7 @@ class APIClient {
     async uploadDocument(file, onProgress) {
         return new Promise((resolve) => {
             const formData = new FormData();
-            formData.append('file', file);
+            formData.append('files', file);
 
             const xhr = new XMLHttpRequest();
 